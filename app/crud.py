@@ -1,14 +1,30 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import date
-from typing import Dict, List, Optional, Tuple
-
-from sqlalchemy import case, func, select
-from sqlalchemy.orm import Session
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    Row,
+    Select,
+    bindparam,
+    case,
+    func,
+    literal,
+    literal_column,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from . import models
 from .schemas import (
+    FLOW_EXPENSE,
+    FLOW_INCOME,
     CashFlowCreate,
     InvestmentLogCreate,
     MasterDataCreate,
@@ -26,24 +42,275 @@ MASTER_TABLES = {
     "dim_metric": models.DimMetric,
 }
 
-MASTER_OVERVIEW = {
-    "accounts": models.DimAccount,
-    "categories": models.DimCategory,
-    "source_types": models.DimSourceType,
-    "action_types": models.DimActionType,
-    "product_types": models.DimProductType,
-    "risk_levels": models.DimRiskLevel,
-    "metrics": models.DimMetric,
+_HAS_STATUS = frozenset(
+    model for model in MASTER_TABLES.values() if "status" in model.__table__.c
+)
+
+# dim table name -> key used in the grouped list_master_data() payload.
+MASTER_TABLE_KEYS = {
+    "dim_account": "accounts",
+    "dim_category": "categories",
+    "dim_source_type": "source_types",
+    "dim_action_type": "action_types",
+    "dim_product_type": "product_types",
+    "dim_risk_level": "risk_levels",
+    "dim_metric": "metrics",
+}
+
+MASTER_OVERVIEW = {key: MASTER_TABLES[table] for table, key in MASTER_TABLE_KEYS.items()}
+
+# Static statements are built once at import; SQLAlchemy's compiled cache
+# then reuses their SQL across requests instead of re-walking the construct.
+_CASH_FLOWS_VIEW_ALL = (
+    select(
+        models.CashFlow.id,
+        models.CashFlow.date,
+        models.DimAccount.name.label("account_name"),
+        models.DimCategory.name.label("category_name"),
+        models.CashFlow.flow_type,
+        models.CashFlow.amount,
+        models.DimSourceType.name.label("source_type_name"),
+        models.CashFlow.remark,
+        models.CashFlow.status,
+    )
+    .outerjoin(models.DimAccount, models.CashFlow.account_id == models.DimAccount.id)
+    .outerjoin(models.DimCategory, models.CashFlow.category_id == models.DimCategory.id)
+    .outerjoin(models.DimSourceType, models.CashFlow.source_type_id == models.DimSourceType.id)
+    .order_by(models.CashFlow.date.desc(), models.CashFlow.id.desc())
+)
+_CASH_FLOWS_VIEW_ACTIVE = _CASH_FLOWS_VIEW_ALL.where(models.CashFlow.status == "active")
+_INVESTMENTS_VIEW_ALL = (
+    select(
+        models.InvestmentLog.id,
+        models.InvestmentLog.date,
+        models.ProductMaster.name.label("product_name"),
+        models.DimActionType.name.label("action_name"),
+        models.InvestmentLog.amount,
+        models.DimAccount.name.label("channel_account_name"),
+        models.InvestmentLog.remark,
+        models.InvestmentLog.status,
+    )
+    .outerjoin(models.ProductMaster, models.InvestmentLog.product_id == models.ProductMaster.id)
+    .outerjoin(models.DimActionType, models.InvestmentLog.action_id == models.DimActionType.id)
+    .outerjoin(models.DimAccount, models.InvestmentLog.channel_account_id == models.DimAccount.id)
+    .order_by(models.InvestmentLog.date.desc(), models.InvestmentLog.id.desc())
+)
+_INVESTMENTS_VIEW_ACTIVE = _INVESTMENTS_VIEW_ALL.where(models.InvestmentLog.status == "active")
+_PRODUCTS_ALL = (
+    select(models.ProductMaster)
+    .options(
+        selectinload(models.ProductMaster.product_type),
+        selectinload(models.ProductMaster.risk_level),
+        raiseload("*"),
+    )
+    .order_by(models.ProductMaster.name)
+)
+_PRODUCTS_ACTIVE = _PRODUCTS_ALL.where(models.ProductMaster.status == "active")
+_PRODUCT_OPTIONS = select(
+    literal("products").label("bucket"),
+    models.ProductMaster.id,
+    models.ProductMaster.name,
+    models.ProductMaster.status,
+).where(models.ProductMaster.status == "active")
+_METRICS_LATEST = select(models.ProductMetric).order_by(models.ProductMetric.record_date.desc())
+_OCR_PENDING = select(models.OcrPending).order_by(models.OcrPending.created_at.desc())
+
+_INVESTED_TOTAL = (
+    select(func.coalesce(func.sum(models.InvestmentLog.amount), 0))
+    .where(models.InvestmentLog.status == "active")
+    .scalar_subquery()
+)
+_ANALYTICS_SUMMARY = select(
+    func.coalesce(
+        func.sum(case((models.CashFlow.flow_type == FLOW_INCOME, models.CashFlow.amount), else_=0)), 0
+    ).label("total_income"),
+    func.coalesce(
+        func.sum(case((models.CashFlow.flow_type == FLOW_EXPENSE, models.CashFlow.amount), else_=0)), 0
+    ).label("total_expense"),
+    _INVESTED_TOTAL.label("total_invested"),
+).where(models.CashFlow.status == "active")
+
+_CASHFLOW_MONTH = func.strftime(literal_column("'%Y-%m'"), models.CashFlow.date).label("month")
+_MONTHLY_CASHFLOW = (
+    select(
+        _CASHFLOW_MONTH,
+        func.sum(
+            case(
+                (models.CashFlow.flow_type == FLOW_INCOME, models.CashFlow.amount),
+                else_=-models.CashFlow.amount,
+            )
+        ),
+    )
+    .where(models.CashFlow.status == "active")
+    .group_by(_CASHFLOW_MONTH)
+    .order_by(_CASHFLOW_MONTH)
+)
+
+
+MASTER_REFERENCES = {
+    "dim_account": (
+        (models.CashFlow, models.CashFlow.account_id),
+        (models.InvestmentLog, models.InvestmentLog.channel_account_id),
+    ),
+    "dim_category": ((models.CashFlow, models.CashFlow.category_id),),
+    "dim_source_type": ((models.CashFlow, models.CashFlow.source_type_id),),
+    "dim_action_type": ((models.InvestmentLog, models.InvestmentLog.action_id),),
+    "dim_product_type": ((models.ProductMaster, models.ProductMaster.type_id),),
+    "dim_risk_level": ((models.ProductMaster, models.ProductMaster.risk_level_id),),
+    "dim_metric": ((models.ProductMetric, models.ProductMetric.metric_id),),
+}
+
+_IMPACT_STATEMENTS = {
+    table: union_all(
+        *(
+            select(literal(model.__tablename__).label("table"), func.count().label("count")).where(
+                column == bindparam("row_id")
+            )
+            for model, column in references
+        )
+    )
+    for table, references in MASTER_REFERENCES.items()
 }
 
 
-def list_master_data(db: Session, include_inactive: bool = False) -> Dict[str, List[models.Base]]:
-    result: Dict[str, List] = {}
+class MasterItem(NamedTuple):
+    id: int
+    name: str
+    status: str
+
+
+class MasterCache:
+    """LRU of dimension-table snapshots, dropped on per-table version bumps or after ttl seconds."""
+
+    def __init__(self, cache_size: int = 32, ttl: float = 300.0) -> None:
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple[str, bool], Tuple[int, float, List[MasterItem]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def version(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def get(self, table: str, include_inactive: bool) -> Optional[List[MasterItem]]:
+        key = (table, include_inactive)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            version, expires_at, items = entry
+            if version != self.version(table) or expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return items
+
+    def put(self, table: str, include_inactive: bool, version: int, items: List[MasterItem]) -> None:
+        key = (table, include_inactive)
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, items)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.cache_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            self._versions[table] = self.version(table) + 1
+
+
+master_cache = MasterCache()
+
+_table_versions: Dict[str, int] = {}
+# Version bumps only cover this process's writes; the TTL bounds staleness from
+# other workers, db_init or manual edits.
+AGGREGATE_TTL = 60.0
+_aggregate_cache: Dict[str, Tuple[Tuple[int, ...], float, object]] = {}
+_versions_lock = threading.Lock()
+
+
+def _touch(table: str) -> None:
+    with _versions_lock:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+
+
+def _cached_aggregate(key: str, tables: Tuple[str, ...], compute):
+    versions = tuple(_table_versions.get(table, 0) for table in tables)
+    entry = _aggregate_cache.get(key)
+    if entry is not None and entry[0] == versions and entry[1] > time.monotonic():
+        return entry[2]
+    value = compute()
+    _aggregate_cache[key] = (versions, time.monotonic() + AGGREGATE_TTL, value)
+    return value
+
+
+def list_master_items(db: Session, table: str, include_inactive: bool = False) -> List[MasterItem]:
+    model_cls = MASTER_TABLES.get(table)
+    if not model_cls:
+        return []
+    cached = master_cache.get(table, include_inactive)
+    if cached is not None:
+        return cached
+    version = master_cache.version(table)
+    stmt = select(model_cls.id, model_cls.name, model_cls.status).order_by(model_cls.name)
+    if not include_inactive:
+        stmt = stmt.where(model_cls.status == "active")
+    items = [MasterItem(*row) for row in db.execute(stmt)]
+    master_cache.put(table, include_inactive, version, items)
+    return items
+
+
+def list_master_data(db: Session, include_inactive: bool = False) -> Dict[str, List[MasterItem]]:
+    return _load_master_data(db, include_inactive)
+
+
+def list_form_context(db: Session) -> Tuple[Dict[str, List[MasterItem]], List[MasterItem]]:
+    """Active dimensions plus active products for the entry forms, fetched in one round trip."""
+    master_data = _load_master_data(db, False, extra={"products": _PRODUCT_OPTIONS})
+    products = master_data.pop("products")
+    return master_data, products
+
+
+def form_etag(db: Session) -> str:
+    """Weak ETag digesting the option snapshot the add forms render from."""
+    # Follows whatever MasterCache and the product table currently hold, so
+    # out-of-band edits change the tag as soon as the rows are reloaded.
+    snapshot = repr(list_form_context(db)).encode("utf-8")
+    return f'W/"forms-{hashlib.blake2b(snapshot, digest_size=8).hexdigest()}"'
+
+
+def _load_master_data(
+    db: Session,
+    include_inactive: bool,
+    extra: Optional[Dict[str, Select]] = None,
+) -> Dict[str, List[MasterItem]]:
+    result: Dict[str, List[MasterItem]] = {}
+    stale: Dict[str, Tuple[str, int]] = {}
     for key, model in MASTER_OVERVIEW.items():
-        query = select(model).order_by(model.name)
-        if not include_inactive and hasattr(model, "status"):
-            query = query.where(model.status == "active")
-        result[key] = list(db.execute(query).scalars())
+        table = model.__tablename__
+        cached = master_cache.get(table, include_inactive)
+        if cached is None:
+            stale[key] = (table, master_cache.version(table))
+            result[key] = []
+        else:
+            result[key] = cached
+    parts = []
+    for key, part in (extra or {}).items():
+        result[key] = []
+        parts.append(part)
+    if not stale and not parts:
+        return result
+
+    for key in stale:
+        model = MASTER_OVERVIEW[key]
+        part = select(literal(key).label("bucket"), model.id, model.name, model.status)
+        if not include_inactive:
+            part = part.where(model.status == "active")
+        parts.append(part)
+    stmt = union_all(*parts).order_by(literal_column("bucket"), literal_column("name"))
+    for bucket, row_id, name, status in db.execute(stmt):
+        result[bucket].append(MasterItem(row_id, name, status))
+    for key, (table, version) in stale.items():
+        master_cache.put(table, include_inactive, version, result[key])
     return result
 
 
@@ -54,7 +321,7 @@ def create_master_data(db: Session, payload: MasterDataCreate) -> models.Base:
     instance = model_cls(name=payload.name)
     db.add(instance)
     db.commit()
-    db.refresh(instance)
+    master_cache.invalidate(payload.table)
     return instance
 
 
@@ -65,51 +332,44 @@ def get_master_item(db: Session, table: str, row_id: int) -> Optional[models.Bas
     return db.get(model_cls, row_id)
 
 
-def toggle_master_status(db: Session, table: str, row_id: int, status: str) -> Optional[models.Base]:
+def _set_status(db: Session, model_cls, row_id: int, status: str) -> bool:
+    result = db.execute(update(model_cls).where(model_cls.id == row_id).values(status=status))
+    db.commit()
+    return result.rowcount > 0
+
+
+def toggle_master_status(db: Session, table: str, row_id: int, status: str) -> bool:
     model_cls = MASTER_TABLES.get(table)
     if not model_cls:
         raise ValueError("Unsupported master table")
-    instance = db.get(model_cls, row_id)
-    if not instance:
-        return None
-    if hasattr(instance, "status"):
-        setattr(instance, "status", status)
-        db.commit()
-        db.refresh(instance)
-    return instance
+    if model_cls not in _HAS_STATUS:
+        return db.get(model_cls, row_id) is not None
+    updated = _set_status(db, model_cls, row_id, status)
+    if updated:
+        master_cache.invalidate(table)
+    return updated
 
 
 def master_impact(db: Session, table: str, row_id: int) -> List[Dict[str, int]]:
-    impact_map = {
-        "dim_account": [
-            (models.CashFlow, models.CashFlow.account_id),
-            (models.InvestmentLog, models.InvestmentLog.channel_account_id),
-        ],
-        "dim_category": [(models.CashFlow, models.CashFlow.category_id)],
-        "dim_source_type": [(models.CashFlow, models.CashFlow.source_type_id)],
-        "dim_action_type": [(models.InvestmentLog, models.InvestmentLog.action_id)],
-        "dim_product_type": [(models.ProductMaster, models.ProductMaster.type_id)],
-        "dim_risk_level": [(models.ProductMaster, models.ProductMaster.risk_level_id)],
-        "dim_metric": [(models.ProductMetric, models.ProductMetric.metric_id)],
-    }
-    checks = impact_map.get(table, [])
-    response: List[Dict[str, int]] = []
-    for model, column in checks:
-        count_stmt = select(func.count()).where(column == row_id)
-        count = db.execute(count_stmt).scalar_one()
-        if count:
-            response.append({"table": model.__tablename__, "count": count})
-    return response
-
-
-def list_cash_flows(db: Session, include_inactive: bool = False) -> List[models.CashFlow]:
-    stmt = (
-        select(models.CashFlow)
-        .order_by(models.CashFlow.date.desc(), models.CashFlow.id.desc())
-    )
-    if not include_inactive:
-        stmt = stmt.where(models.CashFlow.status == "active")
-    return list(db.execute(stmt).scalars())
+    stmt = _IMPACT_STATEMENTS.get(table)
+    if stmt is None:
+        return []
+    return [
+        {"table": table_name, "count": count}
+        for table_name, count in db.execute(stmt, {"row_id": row_id})
+        if count
+    ]
+
+
+def list_cash_flows_view(db: Session, include_inactive: bool = False) -> List[Row]:
+    stmt = _CASH_FLOWS_VIEW_ALL if include_inactive else _CASH_FLOWS_VIEW_ACTIVE
+    return db.execute(stmt).all()
+
+
+def get_cash_flow_view(db: Session, record_id: int) -> Optional[Row]:
+    return db.execute(
+        _CASH_FLOWS_VIEW_ALL.where(models.CashFlow.id == record_id)
+    ).one_or_none()
 
 
 def get_cash_flow(db: Session, record_id: int) -> Optional[models.CashFlow]:
@@ -117,10 +377,10 @@ def get_cash_flow(db: Session, record_id: int) -> Optional[models.CashFlow]:
 
 
 def create_cash_flow(db: Session, payload: CashFlowCreate) -> models.CashFlow:
-    cash_flow = models.CashFlow(**payload.dict())
+    cash_flow = models.CashFlow(**payload.model_dump())
     db.add(cash_flow)
     db.commit()
-    db.refresh(cash_flow)
+    _touch(models.CashFlow.__tablename__)
     return cash_flow
 
 
@@ -128,31 +388,29 @@ def update_cash_flow(db: Session, record_id: int, payload: CashFlowCreate) -> Op
     cash_flow = db.get(models.CashFlow, record_id)
     if not cash_flow:
         return None
-    for field, value in payload.dict().items():
+    for field, value in payload.model_dump().items():
         setattr(cash_flow, field, value)
     db.commit()
-    db.refresh(cash_flow)
+    _touch(models.CashFlow.__tablename__)
     return cash_flow
 
 
-def soft_delete_cashflow(db: Session, record_id: int) -> Optional[models.CashFlow]:
-    cash_flow = db.get(models.CashFlow, record_id)
-    if not cash_flow:
-        return None
-    cash_flow.status = "inactive"
-    db.commit()
-    db.refresh(cash_flow)
-    return cash_flow
+def soft_delete_cashflow(db: Session, record_id: int) -> bool:
+    deleted = _set_status(db, models.CashFlow, record_id, "inactive")
+    if deleted:
+        _touch(models.CashFlow.__tablename__)
+    return deleted
 
 
-def list_investments(db: Session, include_inactive: bool = False) -> List[models.InvestmentLog]:
-    stmt = (
-        select(models.InvestmentLog)
-        .order_by(models.InvestmentLog.date.desc(), models.InvestmentLog.id.desc())
-    )
-    if not include_inactive:
-        stmt = stmt.where(models.InvestmentLog.status == "active")
-    return list(db.execute(stmt).scalars())
+def list_investments_view(db: Session, include_inactive: bool = False) -> List[Row]:
+    stmt = _INVESTMENTS_VIEW_ALL if include_inactive else _INVESTMENTS_VIEW_ACTIVE
+    return db.execute(stmt).all()
+
+
+def get_investment_view(db: Session, record_id: int) -> Optional[Row]:
+    return db.execute(
+        _INVESTMENTS_VIEW_ALL.where(models.InvestmentLog.id == record_id)
+    ).one_or_none()
 
 
 def get_investment(db: Session, record_id: int) -> Optional[models.InvestmentLog]:
@@ -160,10 +418,10 @@ def get_investment(db: Session, record_id: int) -> Optional[models.InvestmentLog
 
 
 def create_investment(db: Session, payload: InvestmentLogCreate) -> models.InvestmentLog:
-    investment = models.InvestmentLog(**payload.dict())
+    investment = models.InvestmentLog(**payload.model_dump())
     db.add(investment)
     db.commit()
-    db.refresh(investment)
+    _touch(models.InvestmentLog.__tablename__)
     return investment
 
 
@@ -171,28 +429,23 @@ def update_investment(db: Session, record_id: int, payload: InvestmentLogCreate)
     investment = db.get(models.InvestmentLog, record_id)
     if not investment:
         return None
-    for field, value in payload.dict().items():
+    for field, value in payload.model_dump().items():
         setattr(investment, field, value)
     db.commit()
-    db.refresh(investment)
+    _touch(models.InvestmentLog.__tablename__)
     return investment
 
 
-def soft_delete_investment(db: Session, record_id: int) -> Optional[models.InvestmentLog]:
-    record = db.get(models.InvestmentLog, record_id)
-    if not record:
-        return None
-    record.status = "inactive"
-    db.commit()
-    db.refresh(record)
-    return record
+def soft_delete_investment(db: Session, record_id: int) -> bool:
+    deleted = _set_status(db, models.InvestmentLog, record_id, "inactive")
+    if deleted:
+        _touch(models.InvestmentLog.__tablename__)
+    return deleted
 
 
 def list_products(db: Session, include_inactive: bool = False) -> List[models.ProductMaster]:
-    stmt = select(models.ProductMaster).order_by(models.ProductMaster.name)
-    if not include_inactive:
-        stmt = stmt.where(models.ProductMaster.status == "active")
-    return list(db.execute(stmt).scalars())
+    stmt = _PRODUCTS_ALL if include_inactive else _PRODUCTS_ACTIVE
+    return db.scalars(stmt).all()
 
 
 def get_product(db: Session, product_id: int) -> Optional[models.ProductMaster]:
@@ -200,47 +453,30 @@ def get_product(db: Session, product_id: int) -> Optional[models.ProductMaster]:
 
 
 def add_product(db: Session, payload: ProductMasterCreate) -> models.ProductMaster:
-    product = models.ProductMaster(**payload.dict())
+    product = models.ProductMaster(**payload.model_dump())
     db.add(product)
     db.commit()
-    db.refresh(product)
     return product
 
 
-def update_product(
-    db: Session,
-    product_id: int,
-    payload: ProductMasterCreate,
-    *,
-    status: Optional[str] = None,
-) -> Optional[models.ProductMaster]:
+def update_product(db: Session, product_id: int, payload: ProductMasterCreate) -> Optional[models.ProductMaster]:
     product = db.get(models.ProductMaster, product_id)
     if not product:
         return None
-    for field, value in payload.dict().items():
+    for field, value in payload.model_dump().items():
         setattr(product, field, value)
-    if status:
-        product.status = status
     db.commit()
-    db.refresh(product)
     return product
 
 
-def update_product_status(db: Session, product_id: int, status: str) -> Optional[models.ProductMaster]:
-    product = db.get(models.ProductMaster, product_id)
-    if not product:
-        return None
-    product.status = status
-    db.commit()
-    db.refresh(product)
-    return product
+def update_product_status(db: Session, product_id: int, status: str) -> bool:
+    return _set_status(db, models.ProductMaster, product_id, status)
 
 
 def add_product_metric(db: Session, payload: ProductMetricCreate) -> models.ProductMetric:
-    metric = models.ProductMetric(**payload.dict())
+    metric = models.ProductMetric(**payload.model_dump())
     db.add(metric)
     db.commit()
-    db.refresh(metric)
     return metric
 
 
@@ -254,10 +490,9 @@ def update_product_metric(
     metric = db.get(models.ProductMetric, record_id)
     if not metric:
         return None
-    for field, value in payload.dict().items():
+    for field, value in payload.model_dump().items():
         setattr(metric, field, value)
     db.commit()
-    db.refresh(metric)
     return metric
 
 
@@ -267,66 +502,49 @@ def list_metrics(
     metric_id: Optional[int] = None,
     limit: int = 50,
 ) -> List[models.ProductMetric]:
-    stmt = select(models.ProductMetric).order_by(models.ProductMetric.record_date.desc())
+    stmt = _METRICS_LATEST
     if product_id:
         stmt = stmt.where(models.ProductMetric.product_id == product_id)
     if metric_id:
         stmt = stmt.where(models.ProductMetric.metric_id == metric_id)
     stmt = stmt.limit(limit)
-    return list(db.execute(stmt).scalars())
+    return db.scalars(stmt).all()
 
 
 def list_ocr_pending(db: Session) -> List[models.OcrPending]:
-    stmt = select(models.OcrPending).order_by(models.OcrPending.created_at.desc())
-    return list(db.execute(stmt).scalars())
+    return db.scalars(_OCR_PENDING).all()
 
 
 def add_ocr_entry(db: Session, module: str, path: str) -> models.OcrPending:
     entry = models.OcrPending(module=module, image_path=path)
     db.add(entry)
     db.commit()
-    db.refresh(entry)
     return entry
 
 
 def analytics_summary(db: Session) -> Dict[str, float]:
-    summary = defaultdict(float)
-
-    income_stmt = select(func.coalesce(func.sum(models.CashFlow.amount), 0)).where(
-        models.CashFlow.flow_type == "收入",
-        models.CashFlow.status == "active",
-    )
-    expense_stmt = select(func.coalesce(func.sum(models.CashFlow.amount), 0)).where(
-        models.CashFlow.flow_type == "支出",
-        models.CashFlow.status == "active",
-    )
-    investment_stmt = select(func.coalesce(func.sum(models.InvestmentLog.amount), 0)).where(
-        models.InvestmentLog.status == "active"
+    return _cached_aggregate(
+        "analytics_summary",
+        (models.CashFlow.__tablename__, models.InvestmentLog.__tablename__),
+        lambda: _analytics_summary(db),
     )
 
-    summary["total_income"] = db.execute(income_stmt).scalar_one()
-    summary["total_expense"] = db.execute(expense_stmt).scalar_one()
-    summary["total_invested"] = db.execute(investment_stmt).scalar_one()
+
+def _analytics_summary(db: Session) -> Dict[str, float]:
+    row = db.execute(_ANALYTICS_SUMMARY).one()
+    summary = dict(row._mapping)
     summary["net_cash"] = summary["total_income"] - summary["total_expense"]
-    return dict(summary)
+    return summary
 
 
 def monthly_cashflow(db: Session) -> List[Tuple[str, float]]:
-    stmt = (
-        select(
-            func.strftime("%Y-%m", models.CashFlow.date),
-            func.sum(
-                case(
-                    (models.CashFlow.flow_type == "收入", models.CashFlow.amount),
-                    else_=-models.CashFlow.amount,
-                )
-            ),
-        )
-        .where(models.CashFlow.status == "active")
-        .group_by(func.strftime("%Y-%m", models.CashFlow.date))
-        .order_by(func.strftime("%Y-%m", models.CashFlow.date))
+    return _cached_aggregate(
+        "monthly_cashflow", (models.CashFlow.__tablename__,), lambda: _monthly_cashflow(db)
     )
-    return [(row[0], row[1]) for row in db.execute(stmt)]
+
+
+def _monthly_cashflow(db: Session) -> List[Tuple[str, float]]:
+    return [(row[0], row[1]) for row in db.execute(_MONTHLY_CASHFLOW)]
 
 
 def update_master_data(
@@ -342,8 +560,8 @@ def update_master_data(
         return None
     if name is not None:
         setattr(instance, "name", name)
-    if status is not None and hasattr(instance, "status"):
-        setattr(instance, "status", status)
+    if status is not None and type(instance) in _HAS_STATUS:
+        instance.status = status
     db.commit()
-    db.refresh(instance)
+    master_cache.invalidate(table)
     return instance
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from sqlalchemy.exc import IntegrityError
+import hashlib
+from collections import defaultdict
+from typing import Iterator, Optional
+
+from sqlalchemy import Index, literal, select, text, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex
 
 from .database import Base, SessionLocal, engine
 from . import models
@@ -16,22 +23,82 @@ MASTER_DEFAULTS = {
     models.DimMetric: ["净值", "收益率", "波动率"],
 }
 
+# Bump whenever models or indexes change in a way create_all has to apply.
+SCHEMA_REVISION = 4
+
+# Indexes earlier revisions created that the models no longer declare.
+OBSOLETE_INDEXES = (
+    "ix_investment_log_status_month",
+    "ix_cash_flow_date",
+    "ix_investment_log_date",
+    "ix_cash_flow_status_date_amount",
+)
+
+
+def _model_indexes() -> Iterator[Index]:
+    for table in Base.metadata.tables.values():
+        yield from table.indexes
+
+
+def _fingerprint() -> str:
+    source = repr(
+        (
+            SCHEMA_REVISION,
+            sorted(Base.metadata.tables),
+            sorted(index.name for index in _model_indexes()),
+            [(model_cls.__tablename__, names) for model_cls, names in MASTER_DEFAULTS.items()],
+        )
+    )
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _stored_fingerprint() -> Optional[str]:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(models.SchemaMeta.fingerprint).limit(1)).scalar()
+    except OperationalError:
+        return None
+
 
 def init_db() -> None:
+    fingerprint = _fingerprint()
+    if _stored_fingerprint() == fingerprint:
+        return
     Base.metadata.create_all(bind=engine)
-    session = SessionLocal()
-    try:
+    with engine.begin() as conn:
+        existing_indexes = set(
+            conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars()
+        )
+        for index in _model_indexes():
+            if index.name not in existing_indexes:
+                conn.execute(CreateIndex(index))
+        for name in OBSOLETE_INDEXES:
+            if name in existing_indexes:
+                conn.execute(text(f"DROP INDEX {name}"))
+    with SessionLocal.begin() as session:
+        existing = defaultdict(set)
+        stmt = union_all(
+            *(
+                select(literal(model_cls.__tablename__).label("table"), model_cls.name).where(
+                    model_cls.name.in_(names)
+                )
+                for model_cls, names in MASTER_DEFAULTS.items()
+            )
+        )
+        for table, name in session.execute(stmt):
+            existing[table].add(name)
         for model_cls, names in MASTER_DEFAULTS.items():
-            for name in names:
-                instance = model_cls(name=name)
-                session.add(instance)
-                try:
-                    session.commit()
-                except IntegrityError:
-                    session.rollback()
-        session.commit()
-    finally:
-        session.close()
+            present = existing[model_cls.__tablename__]
+            missing = [{"name": name} for name in names if name not in present]
+            if missing:
+                session.execute(
+                    sqlite_insert(model_cls.__table__).on_conflict_do_nothing(), missing
+                )
+        session.execute(
+            sqlite_insert(models.SchemaMeta.__table__)
+            .values(id=1, fingerprint=fingerprint)
+            .on_conflict_do_update(index_elements=["id"], set_={"fingerprint": fingerprint})
+        )
 
 
 if __name__ == "__main__":
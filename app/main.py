@@ -3,6 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from .db_init import init_db
 from .routers import (
@@ -15,8 +18,13 @@ from .routers import (
     product_tracker,
     simulation_lab,
 )
+from .templating import warm_templates
 
-app = FastAPI(title="Personal Finance & Investment System")
+app = FastAPI(
+    title="Personal Finance & Investment System",
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(GZipMiddleware, minimum_size=500)
 app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
 
 app.include_router(dashboard.router)
@@ -31,4 +39,5 @@ app.include_router(ocr_pending.router)
 
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    await run_in_threadpool(init_db)
+    await run_in_threadpool(warm_templates)
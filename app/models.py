@@ -2,7 +2,18 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -31,7 +42,6 @@ class DimCategory(Base, StatusMixin):
     name = Column(String, nullable=False)
     parent_id = Column(Integer, ForeignKey("dim_category.id"))
 
-    parent = relationship("DimCategory", remote_side=[id])
     cash_flows = relationship("CashFlow", back_populates="category")
 
 
@@ -85,6 +95,11 @@ class DimMetric(Base, StatusMixin):
 
 class CashFlow(Base):
     __tablename__ = "cash_flow"
+    __table_args__ = (
+        Index("ix_cash_flow_status_date_type_amount", "status", "date", "flow_type", "amount"),
+        # Matches the strftime('%Y-%m', date) grouping in monthly_cashflow.
+        Index("ix_cash_flow_status_month", "status", text("strftime('%Y-%m', date)")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, default=date.today, nullable=False)
@@ -132,6 +147,7 @@ class ProductMaster(Base):
 
 class InvestmentLog(Base):
     __tablename__ = "investment_log"
+    __table_args__ = (Index("ix_investment_log_status_date_amount", "status", "date", "amount"),)
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, default=date.today, nullable=False)
@@ -156,6 +172,9 @@ class InvestmentLog(Base):
 
 class ProductMetric(Base):
     __tablename__ = "product_metrics"
+    __table_args__ = (
+        Index("ix_product_metrics_product_metric_date", "product_id", "metric_id", "record_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("product_master.id"), nullable=False)
@@ -191,3 +210,11 @@ class OcrPending(Base):
     status = Column(String, default="pending", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     remark = Column(Text)
+
+
+class SchemaMeta(Base):
+    __tablename__ = "schema_meta"
+
+    id = Column(Integer, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+
@@ -1,24 +1,24 @@
 from __future__ import annotations
 
-import json
-
+import orjson
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
+from ..templating import templates
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("", response_class=HTMLResponse)
-async def analytics_home(request: Request, db: Session = Depends(get_db)):
+def analytics_home(request: Request, db: Session = Depends(get_db)):
     summary = crud.analytics_summary(db)
     monthly = crud.monthly_cashflow(db)
-    chart_data = json.dumps({"labels": [row[0] for row in monthly], "values": [row[1] for row in monthly]})
+    chart_data = orjson.dumps(
+        {"labels": [row[0] for row in monthly], "values": [row[1] for row in monthly]}
+    ).decode()
     return templates.TemplateResponse(
         "analytics.html",
         {
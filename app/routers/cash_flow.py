@@ -1,37 +1,26 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+from typing import Annotated
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
-from ..schemas import CashFlowCreate
+from ..schemas import CashFlowForm
+from ..templating import render_cached_partial, render_partial, stream_template
+from ..utils import encode_header_value, etag_cached
 
 router = APIRouter(prefix="/cash_flow", tags=["Cash Flow"])
-templates = Jinja2Templates(directory="app/templates")
 
-
-def _render_table(request: Request, db: Session) -> HTMLResponse:
-    cashflows = crud.list_cash_flows(db)
-    return templates.TemplateResponse(
-        "cash_flow/list.html",
-        {
-            "request": request,
-            "cashflows": cashflows,
-        },
-    )
+_TOAST_UPDATED = encode_header_value("收支记录已更新")
 
 
-def _render_row(request: Request, cashflow) -> HTMLResponse:
-    return templates.TemplateResponse(
+def _render_row(cashflow) -> HTMLResponse:
+    return render_partial(
         "partials/_table_row.html",
         {
-            "request": request,
             "row_template": "cash_flow/row.html",
             "item": cashflow,
         },
@@ -39,10 +28,10 @@ def _render_row(request: Request, cashflow) -> HTMLResponse:
 
 
 @router.get("", response_class=HTMLResponse)
-async def page(request: Request, db: Session = Depends(get_db)):
+def page(request: Request, db: Session = Depends(get_db)):
     master_data = crud.list_master_data(db)
-    cashflows = crud.list_cash_flows(db)
-    return templates.TemplateResponse(
+    cashflows = crud.list_cash_flows_view(db)
+    return stream_template(
         "cash_flow/index.html",
         {
             "request": request,
@@ -52,56 +41,44 @@ async def page(request: Request, db: Session = Depends(get_db)):
     )
 
 
-@router.get("/form", response_class=HTMLResponse)
-async def form(request: Request, db: Session = Depends(get_db)):
+def _render_form(db: Session) -> HTMLResponse:
     master_data = crud.list_master_data(db)
-    return templates.TemplateResponse(
-        "cash_flow/form.html",
-        {"request": request, "master_data": master_data},
-    )
+    key = tuple(tuple(items) for items in master_data.values())
+    return render_cached_partial("cash_flow/form.html", {"master_data": master_data}, key)
+
+
+@router.get("/form", response_class=HTMLResponse)
+def form(request: Request, db: Session = Depends(get_db)):
+    return etag_cached(request, crud.form_etag(db), lambda: _render_form(db))
 
 
 @router.post("", response_class=HTMLResponse)
-async def create(
-    request: Request,
+def create(
+    form: Annotated[CashFlowForm, Form()],
     db: Session = Depends(get_db),
-    date_value: str = Form(...),
-    account_id: int = Form(...),
-    category_id: Optional[int] = Form(default=None),
-    flow_type: str = Form(...),
-    amount: float = Form(...),
-    source_type_id: Optional[int] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = CashFlowCreate(
-        date=date.fromisoformat(date_value),
-        account_id=account_id,
-        category_id=category_id,
-        flow_type=flow_type,
-        amount=amount,
-        source_type_id=source_type_id,
-        remark=remark or None,
-    )
-    crud.create_cash_flow(db, payload)
-    return _render_table(request, db)
+    payload = form.to_create()
+    cash_flow = crud.create_cash_flow(db, payload)
+    item = crud.get_cash_flow_view(db, cash_flow.id)
+    db.close()
+    return render_partial("cash_flow/created_row.html", {"item": item})
 
 
 @router.delete("/{record_id}", response_class=HTMLResponse)
-async def delete_record(request: Request, record_id: int, db: Session = Depends(get_db)):
+def delete_record(record_id: int, db: Session = Depends(get_db)):
     crud.soft_delete_cashflow(db, record_id)
-    return _render_table(request, db)
+    return HTMLResponse("")
 
 
 @router.get("/edit/{record_id}", response_class=HTMLResponse)
-async def edit_record(request: Request, record_id: int, db: Session = Depends(get_db)):
+def edit_record(record_id: int, db: Session = Depends(get_db)):
     cashflow = crud.get_cash_flow(db, record_id)
     if not cashflow:
         raise HTTPException(status_code=404, detail="记录不存在")
     master_data = crud.list_master_data(db)
-    return templates.TemplateResponse(
+    return render_partial(
         "partials/_edit_modal.html",
         {
-            "request": request,
             "title": "编辑收支记录",
             "form_action": f"/cash_flow/{record_id}",
             "form_template": "cash_flow/_form_fields.html",
@@ -114,30 +91,16 @@ async def edit_record(request: Request, record_id: int, db: Session = Depends(ge
 
 
 @router.post("/{record_id}", response_class=HTMLResponse)
-async def update_record(
-    request: Request,
+def update_record(
     record_id: int,
+    form: Annotated[CashFlowForm, Form()],
     db: Session = Depends(get_db),
-    date_value: str = Form(...),
-    account_id: int = Form(...),
-    category_id: Optional[int] = Form(default=None),
-    flow_type: str = Form(...),
-    amount: float = Form(...),
-    source_type_id: Optional[int] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = CashFlowCreate(
-        date=date.fromisoformat(date_value),
-        account_id=account_id,
-        category_id=category_id,
-        flow_type=flow_type,
-        amount=amount,
-        source_type_id=source_type_id,
-        remark=remark or None,
-    )
-    cashflow = crud.update_cash_flow(db, record_id, payload)
-    if not cashflow:
+    payload = form.to_create()
+    if not crud.update_cash_flow(db, record_id, payload):
         raise HTTPException(status_code=404, detail="记录不存在")
-    response = _render_row(request, cashflow)
-    response.headers["HX-Toast"] = "收支记录已更新"
+    item = crud.get_cash_flow_view(db, record_id)
+    db.close()
+    response = _render_row(item)
+    response.headers["HX-Toast"] = _TOAST_UPDATED
     return response
@@ -2,18 +2,17 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
+from ..templating import templates
 
 router = APIRouter(tags=["Dashboard"])
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+def dashboard(request: Request, db: Session = Depends(get_db)):
     summary = crud.analytics_summary(db)
     monthly = crud.monthly_cashflow(db)
     return templates.TemplateResponse(
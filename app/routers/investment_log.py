@@ -1,34 +1,31 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+from typing import Annotated
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
-from ..schemas import InvestmentLogCreate
+from ..schemas import InvestmentLogForm
+from ..templating import render_cached_partial, render_partial, stream_template
+from ..utils import encode_header_value, etag_cached
 
 router = APIRouter(prefix="/investment", tags=["Investment Log"])
-templates = Jinja2Templates(directory="app/templates")
 
-
-def _render_table(request: Request, db: Session) -> HTMLResponse:
-    investments = crud.list_investments(db)
-    return templates.TemplateResponse(
-        "investment_log/list.html",
-        {"request": request, "investments": investments},
-    )
+_TOAST_UPDATED = encode_header_value("理财记录已更新")
+_EDIT_MODAL = {
+    "title": "编辑理财操作",
+    "form_template": "investment_log/_form_fields.html",
+    "hx_swap": "outerHTML",
+}
 
 
-def _render_row(request: Request, investment) -> HTMLResponse:
-    return templates.TemplateResponse(
+def _render_row(investment) -> HTMLResponse:
+    return render_partial(
         "partials/_table_row.html",
         {
-            "request": request,
             "row_template": "investment_log/row.html",
             "item": investment,
         },
@@ -36,10 +33,10 @@ def _render_row(request: Request, investment) -> HTMLResponse:
 
 
 @router.get("", response_class=HTMLResponse)
-async def page(request: Request, db: Session = Depends(get_db)):
+def page(request: Request, db: Session = Depends(get_db)):
     master_data = crud.list_master_data(db)
-    investments = crud.list_investments(db)
-    return templates.TemplateResponse(
+    investments = crud.list_investments_view(db)
+    return stream_template(
         "investment_log/index.html",
         {
             "request": request,
@@ -49,65 +46,54 @@ async def page(request: Request, db: Session = Depends(get_db)):
     )
 
 
-@router.get("/form", response_class=HTMLResponse)
-async def form(request: Request, db: Session = Depends(get_db)):
-    master_data = crud.list_master_data(db)
-    products = crud.list_products(db)
-    return templates.TemplateResponse(
+def _render_form(db: Session) -> HTMLResponse:
+    master_data, products = crud.list_form_context(db)
+    key = (tuple(tuple(items) for items in master_data.values()), tuple(products))
+    return render_cached_partial(
         "investment_log/form.html",
         {
-            "request": request,
             "master_data": master_data,
             "products": products,
         },
+        key,
     )
 
 
+@router.get("/form", response_class=HTMLResponse)
+def form(request: Request, db: Session = Depends(get_db)):
+    return etag_cached(request, crud.form_etag(db), lambda: _render_form(db))
+
+
 @router.post("", response_class=HTMLResponse)
-async def create(
-    request: Request,
+def create(
+    form: Annotated[InvestmentLogForm, Form()],
     db: Session = Depends(get_db),
-    date_value: str = Form(...),
-    product_id: int = Form(...),
-    action_id: int = Form(...),
-    amount: float = Form(...),
-    channel_account_id: Optional[int] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = InvestmentLogCreate(
-        date=date.fromisoformat(date_value),
-        product_id=product_id,
-        action_id=action_id,
-        amount=amount,
-        channel_account_id=channel_account_id,
-        remark=remark or None,
-    )
-    crud.create_investment(db, payload)
-    return _render_table(request, db)
+    payload = form.to_create()
+    investment = crud.create_investment(db, payload)
+    item = crud.get_investment_view(db, investment.id)
+    db.close()
+    return render_partial("investment_log/created_row.html", {"item": item})
 
 
 @router.delete("/{record_id}", response_class=HTMLResponse)
-async def delete_record(request: Request, record_id: int, db: Session = Depends(get_db)):
+def delete_record(record_id: int, db: Session = Depends(get_db)):
     crud.soft_delete_investment(db, record_id)
-    return _render_table(request, db)
+    return HTMLResponse("")
 
 
 @router.get("/edit/{record_id}", response_class=HTMLResponse)
-async def edit_record(request: Request, record_id: int, db: Session = Depends(get_db)):
+def edit_record(record_id: int, db: Session = Depends(get_db)):
     investment = crud.get_investment(db, record_id)
     if not investment:
         raise HTTPException(status_code=404, detail="记录不存在")
-    master_data = crud.list_master_data(db)
-    products = crud.list_products(db)
-    return templates.TemplateResponse(
+    master_data, products = crud.list_form_context(db)
+    return render_partial(
         "partials/_edit_modal.html",
         {
-            "request": request,
-            "title": "编辑理财操作",
+            **_EDIT_MODAL,
             "form_action": f"/investment/{record_id}",
-            "form_template": "investment_log/_form_fields.html",
             "hx_target": f"#investment-row-{record_id}",
-            "hx_swap": "outerHTML",
             "master_data": master_data,
             "products": products,
             "item": investment,
@@ -116,28 +102,16 @@ async def edit_record(request: Request, record_id: int, db: Session = Depends(ge
 
 
 @router.post("/{record_id}", response_class=HTMLResponse)
-async def update_record(
-    request: Request,
+def update_record(
     record_id: int,
+    form: Annotated[InvestmentLogForm, Form()],
     db: Session = Depends(get_db),
-    date_value: str = Form(...),
-    product_id: int = Form(...),
-    action_id: int = Form(...),
-    amount: float = Form(...),
-    channel_account_id: Optional[int] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = InvestmentLogCreate(
-        date=date.fromisoformat(date_value),
-        product_id=product_id,
-        action_id=action_id,
-        amount=amount,
-        channel_account_id=channel_account_id,
-        remark=remark or None,
-    )
-    investment = crud.update_investment(db, record_id, payload)
-    if not investment:
+    payload = form.to_create()
+    if not crud.update_investment(db, record_id, payload):
         raise HTTPException(status_code=404, detail="记录不存在")
-    response = _render_row(request, investment)
-    response.headers["HX-Toast"] = "理财记录已更新"
+    item = crud.get_investment_view(db, record_id)
+    db.close()
+    response = _render_row(item)
+    response.headers["HX-Toast"] = _TOAST_UPDATED
     return response
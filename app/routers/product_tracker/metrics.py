@@ -1,27 +1,30 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from sqlalchemy.orm import Session
 
 from ... import crud
 from ...database import get_db
 from ...schemas import ProductMetricCreate
+from ...templating import render_partial, templates
+from ...utils import encode_header_value, etag_cached
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+_TOAST_UPDATED = encode_header_value("指标记录已更新")
 
 
 def _chart_payload(records):
-    records = sorted(records, key=lambda item: item.record_date)
-    return {
-        "dates": [r.record_date.isoformat() for r in records],
-        "values": [r.value for r in records],
-    }
+    # list_metrics returns newest first; the chart runs oldest to newest.
+    dates = []
+    values = []
+    for record in reversed(records):
+        dates.append(record.record_date.isoformat())
+        values.append(record.value)
+    return {"dates": dates, "values": values}
 
 
 def _fetch_records(db: Session, product_id: int, metric_id: int):
@@ -29,15 +32,14 @@ def _fetch_records(db: Session, product_id: int, metric_id: int):
 
 
 @router.get("/metrics", response_class=HTMLResponse)
-async def index(
+def index(
     request: Request,
     product_id: Optional[int] = None,
     metric_id: Optional[int] = None,
     db: Session = Depends(get_db),
 ):
-    master = crud.list_master_data(db)
-    products = crud.list_products(db)
-    metrics = master.get("metrics", [])
+    master, products = crud.list_form_context(db)
+    metrics = master["metrics"]
     if not products or not metrics:
         records = []
         chart = {"dates": [], "values": []}
@@ -63,136 +65,105 @@ async def index(
 
 
 @router.get("/metrics/table", response_class=HTMLResponse)
-async def table_partial(
-    request: Request,
+def table_partial(
     product_id: int,
     metric_id: int,
     db: Session = Depends(get_db),
 ):
     records = _fetch_records(db, product_id, metric_id)
-    return templates.TemplateResponse(
+    return render_partial(
         "product_tracker/metrics/table.html",
         {
-            "request": request,
             "records": records,
         },
     )
 
 
 @router.get("/metrics/data")
-async def metrics_data(
+def metrics_data(
     product_id: int = Query(...),
     metric_id: int = Query(...),
     db: Session = Depends(get_db),
 ):
     records = _fetch_records(db, product_id, metric_id)
-    return JSONResponse(_chart_payload(records))
+    return ORJSONResponse(_chart_payload(records))
 
 
-@router.get("/metrics/form", response_class=HTMLResponse)
-async def form(
-    request: Request,
-    product_id: Optional[int] = None,
-    metric_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-):
-    master = crud.list_master_data(db)
-    products = crud.list_products(db)
-    return templates.TemplateResponse(
+def _render_form(db: Session, product_id: Optional[int], metric_id: Optional[int]) -> HTMLResponse:
+    master, products = crud.list_form_context(db)
+    return render_partial(
         "product_tracker/metrics/form.html",
         {
-            "request": request,
             "products": products,
-            "metrics": master.get("metrics", []),
+            "metrics": master["metrics"],
             "product_id": product_id,
             "metric_id": metric_id,
         },
     )
 
 
-@router.post("/metrics", response_class=HTMLResponse)
-async def create_metric(
+@router.get("/metrics/form", response_class=HTMLResponse)
+def form(
     request: Request,
+    product_id: Optional[int] = None,
+    metric_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    # The query string is part of the browser cache key, so the ETag need not include it.
+    return etag_cached(request, crud.form_etag(db), lambda: _render_form(db, product_id, metric_id))
+
+
+@router.post("/metrics", response_class=HTMLResponse)
+def create_metric(
+    payload: Annotated[ProductMetricCreate, Form()],
     db: Session = Depends(get_db),
-    product_id: int = Form(...),
-    metric_id: int = Form(...),
-    record_date: str = Form(...),
-    value: float = Form(...),
-    source: Optional[str] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = ProductMetricCreate(
-        product_id=product_id,
-        metric_id=metric_id,
-        record_date=date.fromisoformat(record_date),
-        value=value,
-        source=source or None,
-        remark=remark or None,
-    )
     crud.add_product_metric(db, payload)
-    records = _fetch_records(db, product_id, metric_id)
-    return templates.TemplateResponse(
+    records = _fetch_records(db, payload.product_id, payload.metric_id)
+    return render_partial(
         "product_tracker/metrics/table.html",
         {
-            "request": request,
             "records": records,
         },
     )
 
 
 @router.get("/metrics/edit/{record_id}", response_class=HTMLResponse)
-async def edit_metric(request: Request, record_id: int, db: Session = Depends(get_db)):
+def edit_metric(record_id: int, db: Session = Depends(get_db)):
     record = crud.get_metric(db, record_id)
     if not record:
         raise HTTPException(status_code=404, detail="指标不存在")
-    master = crud.list_master_data(db)
-    products = crud.list_products(db)
-    return templates.TemplateResponse(
+    master, products = crud.list_form_context(db)
+    return render_partial(
         "partials/_edit_modal.html",
         {
-            "request": request,
             "title": "编辑指标记录",
             "form_action": f"/product_tracker/metrics/{record_id}",
             "form_template": "product_tracker/metrics/_form_fields.html",
             "hx_target": "#metric-table",
             "hx_swap": "innerHTML",
             "products": products,
-            "metrics": master.get("metrics", []),
+            "metrics": master["metrics"],
             "record": record,
         },
     )
 
 
 @router.post("/metrics/{record_id}", response_class=HTMLResponse)
-async def update_metric(
-    request: Request,
+def update_metric(
     record_id: int,
+    payload: Annotated[ProductMetricCreate, Form()],
     db: Session = Depends(get_db),
-    product_id: int = Form(...),
-    metric_id: int = Form(...),
-    record_date: str = Form(...),
-    value: float = Form(...),
-    source: Optional[str] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = ProductMetricCreate(
-        product_id=product_id,
-        metric_id=metric_id,
-        record_date=date.fromisoformat(record_date),
-        value=value,
-        source=source or None,
-        remark=remark or None,
-    )
     metric = crud.update_product_metric(db, record_id, payload)
     if not metric:
         raise HTTPException(status_code=404, detail="指标不存在")
-    records = _fetch_records(db, product_id, metric_id)
-    response = templates.TemplateResponse(
+    records = _fetch_records(db, payload.product_id, payload.metric_id)
+    response = render_partial(
         "product_tracker/metrics/table.html",
         {
-            "request": request,
             "records": records,
         },
     )
-    response.headers["HX-Toast"] = "指标记录已更新"
+    response.headers["HX-Toast"] = _TOAST_UPDATED
     return response
@@ -1,39 +1,39 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+from typing import Annotated
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from ... import crud
 from ...database import get_db
 from ...schemas import ProductMasterCreate
+from ...templating import render_partial, templates
+from ...utils import encode_header_value, etag_cached
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+_TOAST_UPDATED = encode_header_value("理财产品已更新")
 
 
 def _load_master(db: Session):
-    master = crud.list_master_data(db)
     return {
-        "product_types": master.get("product_types", []),
-        "risk_levels": master.get("risk_levels", []),
+        "product_types": crud.list_master_items(db, "dim_product_type"),
+        "risk_levels": crud.list_master_items(db, "dim_risk_level"),
     }
 
 
-def _render_table(request: Request, db: Session) -> HTMLResponse:
+def _render_table(db: Session) -> HTMLResponse:
     products = crud.list_products(db, include_inactive=True)
-    return templates.TemplateResponse(
+    return render_partial(
         "product_tracker/products/table.html",
-        {"request": request, "products": products},
+        {"products": products},
     )
 
 
 @router.get("/products", response_class=HTMLResponse)
-async def index(request: Request, db: Session = Depends(get_db)):
+def index(request: Request, db: Session = Depends(get_db)):
     products = crud.list_products(db, include_inactive=True)
     master = _load_master(db)
     return templates.TemplateResponse(
@@ -46,46 +46,37 @@ async def index(request: Request, db: Session = Depends(get_db)):
     )
 
 
-@router.get("/products/form", response_class=HTMLResponse)
-async def form(request: Request, db: Session = Depends(get_db)):
+def _render_form(db: Session) -> HTMLResponse:
     master = _load_master(db)
-    return templates.TemplateResponse(
+    return render_partial(
         "product_tracker/products/form.html",
-        {"request": request, "master": master},
+        {"master": master},
     )
 
 
+@router.get("/products/form", response_class=HTMLResponse)
+def form(request: Request, db: Session = Depends(get_db)):
+    return etag_cached(request, crud.form_etag(db), lambda: _render_form(db))
+
+
 @router.post("/products", response_class=HTMLResponse)
-async def create_product(
-    request: Request,
+def create_product(
+    payload: Annotated[ProductMasterCreate, Form()],
     db: Session = Depends(get_db),
-    name: str = Form(...),
-    type_id: Optional[int] = Form(default=None),
-    risk_level_id: Optional[int] = Form(default=None),
-    launch_date: Optional[str] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
 ):
-    payload = ProductMasterCreate(
-        name=name,
-        type_id=type_id,
-        risk_level_id=risk_level_id,
-        launch_date=date.fromisoformat(launch_date) if launch_date else None,
-        remark=remark or None,
-    )
     crud.add_product(db, payload)
-    return _render_table(request, db)
+    return _render_table(db)
 
 
 @router.get("/products/{product_id}/edit", response_class=HTMLResponse)
-async def edit_product(request: Request, product_id: int, db: Session = Depends(get_db)):
+def edit_product(product_id: int, db: Session = Depends(get_db)):
     product = crud.get_product(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="产品不存在")
     master = _load_master(db)
-    return templates.TemplateResponse(
+    return render_partial(
         "partials/_edit_modal.html",
         {
-            "request": request,
             "title": "编辑理财产品",
             "form_action": f"/product_tracker/products/{product_id}",
             "form_template": "product_tracker/products/_form_fields.html",
@@ -99,40 +90,25 @@ async def edit_product(request: Request, product_id: int, db: Session = Depends(
 
 
 @router.post("/products/{product_id}", response_class=HTMLResponse)
-async def update_product(
-    request: Request,
+def update_product(
     product_id: int,
+    payload: Annotated[ProductMasterCreate, Form()],
     db: Session = Depends(get_db),
-    name: str = Form(...),
-    type_id: Optional[int] = Form(default=None),
-    risk_level_id: Optional[int] = Form(default=None),
-    launch_date: Optional[str] = Form(default=None),
-    remark: Optional[str] = Form(default=None),
-    status: str = Form(default="active"),
 ):
-    payload = ProductMasterCreate(
-        name=name,
-        type_id=type_id,
-        risk_level_id=risk_level_id,
-        launch_date=date.fromisoformat(launch_date) if launch_date else None,
-        remark=remark or None,
-    )
-    product = crud.update_product(db, product_id, payload, status=status)
+    product = crud.update_product(db, product_id, payload)
     if not product:
         raise HTTPException(status_code=404, detail="产品不存在")
-    response = _render_table(request, db)
-    response.headers["HX-Toast"] = "理财产品已更新"
+    response = _render_table(db)
+    response.headers["HX-Toast"] = _TOAST_UPDATED
     return response
 
 
 @router.post("/products/{product_id}/status", response_class=HTMLResponse)
-async def update_status(
-    request: Request,
+def update_status(
     product_id: int,
     status: str = Form(...),
     db: Session = Depends(get_db),
 ):
-    product = crud.update_product_status(db, product_id, status)
-    if not product:
+    if not crud.update_product_status(db, product_id, status):
         raise HTTPException(status_code=404, detail="Product not found")
-    return _render_table(request, db)
+    return _render_table(db)
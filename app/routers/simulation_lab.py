@@ -2,18 +2,17 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
+from ..templating import render_partial, templates
 
 router = APIRouter(prefix="/simulation", tags=["Simulation Lab"])
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("", response_class=HTMLResponse)
-async def simulation_home(request: Request, db: Session = Depends(get_db)):
+def simulation_home(request: Request, db: Session = Depends(get_db)):
     products = crud.list_products(db)
     return templates.TemplateResponse(
         "simulation_lab.html",
@@ -25,8 +24,7 @@ async def simulation_home(request: Request, db: Session = Depends(get_db)):
 
 
 @router.post("/calc", response_class=HTMLResponse)
-async def simulation_calc(
-    request: Request,
+def simulation_calc(
     db: Session = Depends(get_db),
     product_id: str = Form(...),
     amount: str = Form(...),
@@ -40,11 +38,10 @@ async def simulation_calc(
         annual_yield = max(product.holding.avg_yield, 0.02)
     est_profit = invest_amount * annual_yield * days / 365
     context = {
-        "request": request,
         "product": product,
         "amount": invest_amount,
         "days": days,
         "annual_yield": annual_yield,
         "est_profit": est_profit,
     }
-    return templates.TemplateResponse("partials/simulation_result.html", context)
+    return render_partial("partials/simulation_result.html", context)
@@ -1,39 +1,104 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, Field
+
+FLOW_INCOME = "收入"
+FLOW_EXPENSE = "支出"
+
+
+def _blank_to_none(value):
+    return value or None
+
+
+# Blank form inputs arrive as "" and are stored as NULL.
+OptionalText = Annotated[Optional[str], BeforeValidator(_blank_to_none)]
+OptionalId = Annotated[Optional[int], BeforeValidator(_blank_to_none)]
+OptionalDate = Annotated[Optional[date], BeforeValidator(_blank_to_none)]
+
+
+def _prevalidated(model_cls, **fields):
+    # Form models validate with the same field types as the create schemas,
+    # so their output can skip a second validation pass.
+    return model_cls.model_construct(**fields)
 
 
 class CashFlowCreate(BaseModel):
     date: date
     account_id: int
     category_id: Optional[int] = None
-    flow_type: str = Field(pattern="^(收入|支出)$")
+    flow_type: str = Field(pattern=f"^({FLOW_INCOME}|{FLOW_EXPENSE})$")
     amount: float
     source_type_id: Optional[int] = None
-    remark: Optional[str] = None
+    remark: OptionalText = None
     link_investment_id: Optional[int] = None
 
 
+class CashFlowForm(BaseModel):
+    """Fields as posted by cash_flow/_form_fields.html."""
+
+    date_value: date
+    account_id: int
+    category_id: OptionalId = None
+    flow_type: str = Field(pattern=f"^({FLOW_INCOME}|{FLOW_EXPENSE})$")
+    amount: float
+    source_type_id: OptionalId = None
+    remark: OptionalText = None
+
+    def to_create(self) -> CashFlowCreate:
+        return _prevalidated(
+            CashFlowCreate,
+            date=self.date_value,
+            account_id=self.account_id,
+            category_id=self.category_id,
+            flow_type=self.flow_type,
+            amount=self.amount,
+            source_type_id=self.source_type_id,
+            remark=self.remark,
+        )
+
+
 class InvestmentLogCreate(BaseModel):
     date: date
     product_id: int
     action_id: int
     amount: float
     channel_account_id: Optional[int] = None
-    remark: Optional[str] = None
+    remark: OptionalText = None
     cashflow_link_id: Optional[int] = None
 
 
+class InvestmentLogForm(BaseModel):
+    """Fields as posted by investment_log/_form_fields.html."""
+
+    date_value: date
+    product_id: int
+    action_id: int
+    amount: float
+    channel_account_id: OptionalId = None
+    remark: OptionalText = None
+
+    def to_create(self) -> InvestmentLogCreate:
+        return _prevalidated(
+            InvestmentLogCreate,
+            date=self.date_value,
+            product_id=self.product_id,
+            action_id=self.action_id,
+            amount=self.amount,
+            channel_account_id=self.channel_account_id,
+            remark=self.remark,
+        )
+
+
 class ProductMasterCreate(BaseModel):
     name: str
-    type_id: Optional[int] = None
-    risk_level_id: Optional[int] = None
-    launch_date: Optional[date] = None
-    remark: Optional[str] = None
-    status: str = "active"
+    type_id: OptionalId = None
+    risk_level_id: OptionalId = None
+    launch_date: OptionalDate = None
+    remark: OptionalText = None
+    status: str = Field(default="active", pattern="^(active|inactive)$")
 
 
 class ProductMetricCreate(BaseModel):
@@ -41,8 +106,8 @@ class ProductMetricCreate(BaseModel):
     metric_id: int
     record_date: date
     value: float
-    source: Optional[str] = None
-    remark: Optional[str] = None
+    source: OptionalText = None
+    remark: OptionalText = None
 
 
 class MasterDataCreate(BaseModel):
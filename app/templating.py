@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Tuple
+
+from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# Template edits are only picked up without a restart when PFIS_ENV=dev.
+templates.env.auto_reload = os.getenv("PFIS_ENV") == "dev"
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+
+FRAGMENT_CACHE_SIZE = 64
+STREAM_CHUNK_SIZE = 32 * 1024
+_fragment_cache: "OrderedDict[Tuple[str, Hashable], str]" = OrderedDict()
+_fragment_lock = threading.Lock()
+
+
+def warm_templates() -> None:
+    """Compile every template up front so the first request to each page doesn't pay for it."""
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(name)
+
+
+def render_partial(name: str, context: Dict[str, Any]) -> HTMLResponse:
+    """Render an HTMX fragment straight to HTML, skipping TemplateResponse's request plumbing."""
+    return HTMLResponse(templates.get_template(name).render(context))
+
+
+def render_cached_partial(name: str, context: Dict[str, Any], key: Hashable) -> HTMLResponse:
+    """Like render_partial, but reuses the HTML while ``key`` (a snapshot of the inputs) is unchanged."""
+    if templates.env.auto_reload:
+        return render_partial(name, context)
+    cache_key = (name, key)
+    with _fragment_lock:
+        html = _fragment_cache.get(cache_key)
+        if html is not None:
+            _fragment_cache.move_to_end(cache_key)
+            return HTMLResponse(html)
+    html = templates.get_template(name).render(context)
+    with _fragment_lock:
+        _fragment_cache[cache_key] = html
+        while len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+            _fragment_cache.popitem(last=False)
+    return HTMLResponse(html)
+
+
+def _batched(parts: Iterator[str], size: int) -> Iterator[str]:
+    buffer: List[str] = []
+    buffered = 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_template(name: str, context: Dict[str, Any]) -> StreamingResponse:
+    """Send a full page as Jinja renders it, so long tables never sit in memory as one string."""
+    # generate() yields tiny fragments; each chunk costs a threadpool hop, so batch them.
+    parts = templates.get_template(name).generate(context)
+    return StreamingResponse(_batched(parts, STREAM_CHUNK_SIZE), media_type="text/html")
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable
+from urllib.parse import quote
+
+from fastapi import Request, Response
+
+
+@lru_cache(maxsize=64)
+def encode_header_value(value: str) -> str:
+    """Percent-encode text for a response header; browsers read it back with decodeURIComponent."""
+    return quote(value, safe="")
+
+
+def etag_cached(request: Request, etag: str, render: Callable[[], Response]) -> Response:
+    """Answer 304 when the client already holds ``etag``; otherwise call ``render`` and tag the result."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    response = render()
+    response.headers.update(headers)
+    return response